@@ -11,7 +11,7 @@ consent management, and human-in-the-loop workflows.
 import os
 import sys
 import json
-from typing import Dict, List, Optional, Any
+from typing import Annotated, Dict, List, Literal, Optional, Any, Union
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -466,6 +466,7 @@ async def list_agents():
             "portfolio_create": "/agents/chandufinance/portfolio/create",
             "portfolio_analyze": "/agents/chandufinance/portfolio/analyze", 
             "portfolio_rebalance": "/agents/chandufinance/portfolio/rebalance",
+            "portfolio_batch": "/agents/chandufinance/portfolio/batch",
             # Financial Analytics
             "analytics_cashflow": "/agents/chandufinance/analytics/cashflow",
             "analytics_spending": "/agents/chandufinance/analytics/spending",
@@ -1834,6 +1835,33 @@ class PortfolioValueRequest(BaseModel):
     portfolio_id: str = Field(..., description="Portfolio ID")
     include_performance: bool = Field(True, description="Include performance metrics")
 
+class PortfolioAnalyzeOp(BaseModel):
+    """Batch operation: analyze the portfolio."""
+    op: Literal["analyze"]
+    holdings: Optional[List[Dict[str, Any]]] = Field(None, description="Current holdings")
+
+class PortfolioRebalanceOp(BaseModel):
+    """Batch operation: suggest a rebalance."""
+    op: Literal["rebalance"]
+
+class PortfolioValueOp(BaseModel):
+    """Batch operation: value the portfolio."""
+    op: Literal["value"]
+    include_performance: bool = Field(True, description="Include performance metrics")
+
+PortfolioBatchOp = Annotated[
+    Union[PortfolioAnalyzeOp, PortfolioRebalanceOp, PortfolioValueOp],
+    Field(discriminator="op")
+]
+
+class PortfolioBatchRequest(BaseModel):
+    """Request model for running several portfolio operations in one call."""
+    user_id: str = Field(..., description="User identifier")
+    token: str = Field(..., description="HushhMCP consent token")
+    portfolio_id: str = Field(..., description="Portfolio ID shared by every operation")
+    ops: List[PortfolioBatchOp] = Field(..., description="Operations to run in order")
+    gemini_api_key: Optional[str] = Field(None, description="Gemini API key for AI features")
+
 # Planning Models
 class RetirementPlanningRequest(BaseModel):
     """Request model for retirement planning."""
@@ -1864,6 +1892,10 @@ class FinanceApiResponse(BaseModel):
     processing_time: float = Field(..., description="Processing time in seconds")
     errors: Optional[List[str]] = Field(None, description="Any errors encountered")
 
+class PortfolioBatchResponse(BaseModel):
+    """Response model for batched portfolio operations."""
+    ops: List[FinanceApiResponse] = Field(..., description="One response per requested operation, in request order")
+
 # ============================================================================
 # PORTFOLIO MANAGEMENT ENDPOINTS
 # ============================================================================
@@ -2323,6 +2355,45 @@ async def get_portfolio_value(request: PortfolioValueRequest):
             processing_time=processing_time
         )
 
+@app.post("/agents/chandufinance/portfolio/batch", response_model=PortfolioBatchResponse)
+async def batch_portfolio_operations(request: PortfolioBatchRequest):
+    """Run analyze/rebalance/value operations on one portfolio in a single round-trip."""
+    common = {
+        'user_id': request.user_id,
+        'token': request.token,
+        'portfolio_id': request.portfolio_id
+    }
+    responses = []
+    
+    for op in request.ops:
+        start_time = datetime.now(timezone.utc)
+        
+        # Each operation reuses its standalone endpoint, so results match the individual calls;
+        # a failing operation is reported in its own slot and the rest still run
+        try:
+            if isinstance(op, PortfolioAnalyzeOp):
+                response = await analyze_portfolio(PortfolioAnalyzeRequest(
+                    **common, holdings=op.holdings, gemini_api_key=request.gemini_api_key
+                ))
+            elif isinstance(op, PortfolioRebalanceOp):
+                response = await rebalance_portfolio(PortfolioRebalanceRequest(
+                    **common, gemini_api_key=request.gemini_api_key
+                ))
+            else:
+                response = await get_portfolio_value(PortfolioValueRequest(
+                    **common, include_performance=op.include_performance
+                ))
+        except Exception as e:
+            response = FinanceApiResponse(
+                status="error",
+                data={},
+                errors=[e.detail if isinstance(e, HTTPException) else str(e)],
+                processing_time=(datetime.now(timezone.utc) - start_time).total_seconds()
+            )
+        responses.append(response)
+    
+    return PortfolioBatchResponse(ops=responses)
+
 # ============================================================================
 # ADVANCED PLANNING ENDPOINTS
 # ============================================================================
@@ -44,7 +44,7 @@ def print_comparison():
             "feature": "Placeholder System",
             "mailer": "✅ Manual placeholder definition",
             "mailerpanda": "✅ Auto-detection from Excel",
-            "enhancement": "Automatic column detection, SafeDict handling"
+            "enhancement": "Automatic column detection, safe placeholder handling"
         },
         {
             "feature": "Consent Framework",
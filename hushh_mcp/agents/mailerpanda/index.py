@@ -4,6 +4,9 @@ import json
 import pandas as pd
 import re
 import base64
+import copy
+import hashlib
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta, timezone
 from mailjet_rest import Client
 from typing import List, Dict, Annotated, Optional
@@ -53,10 +56,51 @@ class AgentState(TypedDict):
     # ✨ PRE-APPROVED TEMPLATE SUPPORT
     use_pre_approved: Annotated[bool, lambda old, new: new]
 
-class SafeDict(dict):
-    """Custom dict that handles missing placeholders gracefully."""
-    def __missing__(self, key):
-        return "{" + key + "}"
+# JSON separators without padding whitespace, used for the email memory file
+COMPACT_JSON = (',', ':')
+
+# Characters of each stored example shown to the LLM as a style reference, sliced at display time
+CONTENT_PREVIEW_LENGTH = 200
+
+# How many email examples and feedback entries the memory keeps
+MAX_EMAIL_EXAMPLES = 10
+MAX_FEEDBACK_HISTORY = 20
+
+# How many users' decrypted memory the agent keeps in process; least recently used goes first
+MAX_MEMORY_CACHE_USERS = 32
+
+# Tag patterns for parsing LLM output, compiled once at import
+SUB_TAG_RE = re.compile(r"<sub>(.*?)</sub>", re.DOTALL)
+SUBJECT_TAG_RE = re.compile(r"<subject>(.*?)</subject>", re.DOTALL)
+CONTENT_TAG_RE = re.compile(r"<content>(.*?)</content>", re.DOTALL)
+USER_EMAIL_TAG_RE = re.compile(r"<user_email>(.*?)</user_email>", re.DOTALL)
+RECEIVER_EMAILS_TAG_RE = re.compile(r"<receiver_emails>(.*?)</receiver_emails>", re.DOTALL)
+PLACEHOLDER_RE = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+
+# Feedback keywords and the style request they signal, checked in order
+FEEDBACK_STYLE_RULES = (
+    (('more formal', 'formal'), "User prefers more formal language"),
+    (('casual', 'informal'), "User prefers casual/informal language"),
+    (('shorter', 'brief'), "User prefers shorter emails"),
+    (('longer', 'detailed'), "User prefers detailed emails"),
+    (('personal',), "User wants more personalization"),
+)
+
+def compile_template(template: str) -> List[str]:
+    """Split a template into literal text (even positions) and placeholder names (odd positions)."""
+    return PLACEHOLDER_RE.split(template)
+
+def render_template(parts: List[str], contact: Dict) -> str:
+    """Fill a compiled template from contact data, leaving unknown placeholders as-is."""
+    rendered = parts[:]
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        rendered[i] = str(contact.get(name, "{" + name + "}"))
+    return "".join(rendered)
+
+def personalize(template: str, contact: Dict) -> str:
+    """Fill {placeholders} from contact data, leaving unknown placeholders as-is."""
+    return render_template(compile_template(template), contact)
 
 class MassMailerAgent:
     """
@@ -77,6 +121,9 @@ class MassMailerAgent:
         # Initialize LLM with dynamic API keys
         self._initialize_llm()
         
+        # Decrypted email memory per user, LRU-bounded: user_id -> (file digest, memory dict)
+        self._memory_cache = OrderedDict()
+        
         # Path to the Excel file within the agent's directory
         self.contacts_file_path = os.path.join(os.path.dirname(__file__), 'email_list.xlsx')
         
@@ -284,6 +331,27 @@ class MassMailerAgent:
         Returns:
             str: Memory storage key
         """
+        return self._save_user_email_memory_batch(user_id, [email_data], consent_tokens)
+
+    def _save_user_email_memory_batch(self, user_id: str, email_data_list: List[Dict], consent_tokens: Dict[str, str]) -> str:
+        """
+        Saves several emails to the user's memory with a single decrypt and write.
+        
+        The result matches calling _save_user_email_memory once per entry in
+        order: preferences come from the last entry, examples and feedback
+        are appended in sequence.
+        
+        Args:
+            user_id: User identifier
+            email_data_list: Email preference dictionaries, oldest first
+            consent_tokens: Consent tokens for validation
+            
+        Returns:
+            str: Memory storage key
+        """
+        if not email_data_list:
+            return ""
+        
         try:
             # Validate consent for vault write operations
             self._validate_consent_for_operation(consent_tokens, "campaign_storage", user_id)
@@ -296,8 +364,9 @@ class MassMailerAgent:
             memory_file = os.path.join(user_vault_dir, "email_preferences.enc")
             existing_memory = self._load_user_email_memory(user_id, consent_tokens)
             
-            # Prepare memory data
+            # Prepare memory data; preferences follow the most recent email
             timestamp = datetime.now(timezone.utc).isoformat()
+            email_data = email_data_list[-1]
             memory_data = {
                 'user_id': user_id,
                 'agent_id': self.agent_id,
@@ -315,42 +384,44 @@ class MassMailerAgent:
                     'key_phrases': email_data.get('key_phrases', []),
                     'avoid_phrases': email_data.get('avoid_phrases', [])
                 },
-                'email_examples': existing_memory.get('email_examples', []) if existing_memory else [],
-                'feedback_history': existing_memory.get('feedback_history', []) if existing_memory else [],
+                # Bounded copies: a failed save never alters the cached memory, and
+                # appending past the cap drops the oldest entry
+                'email_examples': deque(existing_memory.get('email_examples', []) if existing_memory else [], maxlen=MAX_EMAIL_EXAMPLES),
+                'feedback_history': deque(existing_memory.get('feedback_history', []) if existing_memory else [], maxlen=MAX_FEEDBACK_HISTORY),
+                # Saves never add to campaign history, so the stored list is carried over as-is
                 'campaign_history': existing_memory.get('campaign_history', []) if existing_memory else []
             }
             
-            # Add current email as example if provided
-            if email_data.get('email_template') and email_data.get('subject'):
-                new_example = {
-                    'subject': email_data['subject'],
-                    'content': email_data['email_template'],
-                    'user_input': email_data.get('user_input', ''),
-                    'timestamp': timestamp,
-                    'campaign_id': email_data.get('campaign_id', ''),
-                    'user_satisfaction': email_data.get('user_satisfaction', 'unknown')
-                }
-                memory_data['email_examples'].append(new_example)
-                
-                # Keep only last 10 examples to avoid bloat
-                memory_data['email_examples'] = memory_data['email_examples'][-10:]
-            
-            # Add user feedback if provided
-            if email_data.get('user_feedback'):
-                feedback_entry = {
-                    'feedback': email_data['user_feedback'],
-                    'timestamp': timestamp,
-                    'campaign_id': email_data.get('campaign_id', ''),
-                    'original_input': email_data.get('user_input', '')
-                }
-                memory_data['feedback_history'].append(feedback_entry)
+            for email_data in email_data_list:
+                # Add current email as example if provided
+                if email_data.get('email_template') and email_data.get('subject'):
+                    new_example = {
+                        'subject': email_data['subject'],
+                        'content': email_data['email_template'],
+                        'user_input': email_data.get('user_input', ''),
+                        'timestamp': timestamp,
+                        'campaign_id': email_data.get('campaign_id', ''),
+                        'user_satisfaction': email_data.get('user_satisfaction', 'unknown')
+                    }
+                    memory_data['email_examples'].append(new_example)
                 
-                # Keep only last 20 feedback entries
-                memory_data['feedback_history'] = memory_data['feedback_history'][-20:]
+                # Add user feedback if provided
+                if email_data.get('user_feedback'):
+                    feedback_entry = {
+                        'feedback': email_data['user_feedback'],
+                        'timestamp': timestamp,
+                        'campaign_id': email_data.get('campaign_id', ''),
+                        'original_input': email_data.get('user_input', '')
+                    }
+                    memory_data['feedback_history'].append(feedback_entry)
+            
+            # Back to plain lists for JSON and for readers that slice them
+            memory_data['email_examples'] = list(memory_data['email_examples'])
+            memory_data['feedback_history'] = list(memory_data['feedback_history'])
             
-            # Encrypt and save to file
+            # Encrypt and save to file (compact JSON keeps the ciphertext small)
             from hushh_mcp.config import VAULT_ENCRYPTION_KEY
-            encrypted_data = encrypt_data(json.dumps(memory_data), VAULT_ENCRYPTION_KEY)
+            encrypted_data = encrypt_data(json.dumps(memory_data, separators=COMPACT_JSON), VAULT_ENCRYPTION_KEY)
             
             # Save encrypted data to file
             with open(memory_file, 'w') as f:
@@ -360,7 +431,10 @@ class MassMailerAgent:
                     'tag': encrypted_data.tag,
                     'encoding': encrypted_data.encoding,
                     'algorithm': encrypted_data.algorithm
-                }, f)
+                }, f, separators=COMPACT_JSON)
+            
+            # The next load decrypts what was just written
+            self._memory_cache.pop(user_id, None)
             
             print(f"💾 User email preferences saved to vault: {memory_file}")
             return memory_file
@@ -386,25 +460,30 @@ class MassMailerAgent:
             
             # Check for user's memory file
             memory_file = os.path.join("vault", user_id, "email_preferences.enc")
-            if not os.path.exists(memory_file):
+            try:
+                with open(memory_file, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
                 print(f"📝 No email preferences found for user {user_id}")
                 return None
             
+            # Skip the decrypt when the file content matches what was cached; callers get
+            # their own copy so they cannot alter the cached memory
+            digest = hashlib.sha256(raw).digest()
+            cached = self._memory_cache.get(user_id)
+            if cached and cached[0] == digest:
+                self._memory_cache.move_to_end(user_id)
+                print("💾 User email preferences loaded from cache")
+                return copy.deepcopy(cached[1])
+            
             # Load and decrypt memory data
-            with open(memory_file, 'r') as f:
-                encrypted_file_data = json.load(f)
+            encrypted_file_data = json.loads(raw)
             
             from hushh_mcp.config import VAULT_ENCRYPTION_KEY
             from hushh_mcp.types import EncryptedPayload
             
-            # Reconstruct EncryptedPayload object
-            encrypted_payload = EncryptedPayload(
-                ciphertext=encrypted_file_data['ciphertext'],
-                iv=encrypted_file_data['iv'],
-                tag=encrypted_file_data['tag'],
-                encoding=encrypted_file_data['encoding'],
-                algorithm=encrypted_file_data['algorithm']
-            )
+            # Reconstruct EncryptedPayload object; validation turns a truncated or edited file into a clear error
+            encrypted_payload = EncryptedPayload.model_validate(encrypted_file_data)
             
             # Decrypt data
             decrypted_data = decrypt_data(encrypted_payload, VAULT_ENCRYPTION_KEY)
@@ -416,7 +495,11 @@ class MassMailerAgent:
             print(f"   📧 Examples: {len(memory_data.get('email_examples', []))}")
             print(f"   💬 Feedback: {len(memory_data.get('feedback_history', []))}")
             
-            return memory_data
+            self._memory_cache[user_id] = (digest, memory_data)
+            self._memory_cache.move_to_end(user_id)
+            if len(self._memory_cache) > MAX_MEMORY_CACHE_USERS:
+                self._memory_cache.popitem(last=False)
+            return copy.deepcopy(memory_data)
             
         except Exception as e:
             print(f"⚠️ Failed to load email memory: {e}")
@@ -467,19 +550,14 @@ class MassMailerAgent:
             common_requests = []
             for fb in recent_feedback:
                 feedback_text = fb.get('feedback', '').lower()
-                if 'more formal' in feedback_text or 'formal' in feedback_text:
-                    common_requests.append("User prefers more formal language")
-                elif 'casual' in feedback_text or 'informal' in feedback_text:
-                    common_requests.append("User prefers casual/informal language")
-                elif 'shorter' in feedback_text or 'brief' in feedback_text:
-                    common_requests.append("User prefers shorter emails")
-                elif 'longer' in feedback_text or 'detailed' in feedback_text:
-                    common_requests.append("User prefers detailed emails")
-                elif 'personal' in feedback_text:
-                    common_requests.append("User wants more personalization")
+                for keywords, request in FEEDBACK_STYLE_RULES:
+                    if any(keyword in feedback_text for keyword in keywords):
+                        common_requests.append(request)
+                        break
             
             if common_requests:
-                style_guide.append(f"Recent feedback patterns: {'; '.join(set(common_requests))}")
+                # dict.fromkeys dedupes while keeping a stable order
+                style_guide.append(f"Recent feedback patterns: {'; '.join(dict.fromkeys(common_requests))}")
         
         # Example analysis
         if examples:
@@ -555,10 +633,10 @@ class MassMailerAgent:
 
     def _parse_llm_output(self, raw_output: str) -> dict:
         """Parses structured LLM output using XML-like tags."""
-        subject_match = re.search(r"<sub>(.*?)</sub>", raw_output, re.DOTALL)
-        content_match = re.search(r"<content>(.*?)</content>", raw_output, re.DOTALL)
-        user_email_match = re.search(r"<user_email>(.*?)</user_email>", raw_output, re.DOTALL)
-        receiver_emails_match = re.search(r"<receiver_emails>(.*?)</receiver_emails>", raw_output, re.DOTALL)
+        subject_match = SUB_TAG_RE.search(raw_output)
+        content_match = CONTENT_TAG_RE.search(raw_output)
+        user_email_match = USER_EMAIL_TAG_RE.search(raw_output)
+        receiver_emails_match = RECEIVER_EMAILS_TAG_RE.search(raw_output)
 
         subject = subject_match.group(1).strip() if subject_match else ""
         content = content_match.group(1).strip() if content_match else ""
@@ -720,7 +798,7 @@ class MassMailerAgent:
                 for i, example in enumerate(recent_examples, 1):
                     memory_context += f"Example {i}:\n"
                     memory_context += f"Subject: {example.get('subject', 'N/A')}\n"
-                    memory_context += f"Content: {example.get('content', 'N/A')[:200]}...\n\n"
+                    memory_context += f"Content: {example.get('content', 'N/A')[:CONTENT_PREVIEW_LENGTH]}...\n\n"
             
             # Add recent feedback patterns
             if feedback_history:
@@ -1162,9 +1240,8 @@ customized email content here
                 response = self.llm.invoke(prompt)
                 
                 # Parse the response
-                import re
-                subject_match = re.search(r"<subject>(.*?)</subject>", response.content, re.DOTALL)
-                content_match = re.search(r"<content>(.*?)</content>", response.content, re.DOTALL)
+                subject_match = SUBJECT_TAG_RE.search(response.content)
+                content_match = CONTENT_TAG_RE.search(response.content)
                 
                 customized_subject = subject_match.group(1).strip() if subject_match else base_subject
                 customized_content = content_match.group(1).strip() if content_match else base_template
@@ -1247,6 +1324,10 @@ customized email content here
                 if 'Status' not in df.columns:
                     df['Status'] = ""
 
+                # The campaign subject and template are the same for every contact; parse them once
+                subject_parts = compile_template(subject)
+                template_parts = compile_template(template)
+
                 print("🚀 [DEBUG] About to start contact loop...")
                 for i, row in df.iterrows():
                     print(f"🚀 [DEBUG] Processing contact {i}: {row.get('email', 'no email')}")
@@ -1263,9 +1344,6 @@ customized email content here
                         if not from_email:
                             raise ValueError("Sender email not configured.")
 
-                        # Create safe dict for placeholder replacement
-                        safe_contact = SafeDict(contact_dict)
-
                         # ✨ AI-POWERED PERSONALIZATION: Check if personalization is enabled and we have description
                         contact_description = contact_dict.get('description', '')
                         personalization_enabled = state.get('enable_description_personalization', False)
@@ -1286,8 +1364,8 @@ customized email content here
                             personalized_content = customized["content"]
                             
                             # Then apply any remaining placeholder substitution
-                            personalized_subject = personalized_subject.format_map(safe_contact)
-                            personalized_content = personalized_content.format_map(safe_contact)
+                            personalized_subject = personalize(personalized_subject, contact_dict)
+                            personalized_content = personalize(personalized_content, contact_dict)
                             
                             print(f"✨ [DEBUG] AI-personalized subject: {personalized_subject}")
                             print(f"✨ [DEBUG] AI-personalized content: {personalized_content[:100]}...")
@@ -1301,8 +1379,8 @@ customized email content here
                                 print(f"📝 [DEBUG] No description found for {row.get('name')}, using standard template")
                             
                             # Fall back to simple placeholder replacement
-                            personalized_subject = subject.format_map(safe_contact)
-                            personalized_content = template.format_map(safe_contact)
+                            personalized_subject = render_template(subject_parts, contact_dict)
+                            personalized_content = render_template(template_parts, contact_dict)
                             
                             print(f"� [DEBUG] Standard personalized content: {personalized_content[:100]}...")
                             print(f"🔍 [DEBUG] Subject after replacement: {personalized_subject}")
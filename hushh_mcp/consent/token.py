@@ -4,7 +4,7 @@ import hmac
 import hashlib
 import base64
 import time
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from hushh_mcp.config import SECRET_KEY, DEFAULT_CONSENT_TOKEN_EXPIRY_MS
 from hushh_mcp.constants import CONSENT_TOKEN_PREFIX
@@ -33,6 +33,34 @@ def issue_token(
         scope_value = scope.value if hasattr(scope, 'value') else str(scope)
         token_scope = scope
     
+    return _build_token(user_id, agent_id, scope, scope_value, issued_at, expires_at)
+
+def issue_tokens(
+    user_id: UserID,
+    agent_id: AgentID,
+    scopes: List[ConsentScope],
+    expires_in_ms: int = DEFAULT_CONSENT_TOKEN_EXPIRY_MS
+) -> List[HushhConsentToken]:
+    """Issue one token per scope, in order, sharing a single issue time."""
+    issued_at = int(time.time() * 1000)
+    expires_at = issued_at + expires_in_ms
+    tokens = []
+    
+    for scope in scopes:
+        scope_value = scope.value if hasattr(scope, 'value') else str(scope)
+        tokens.append(_build_token(user_id, agent_id, scope, scope_value, issued_at, expires_at))
+    
+    return tokens
+
+def _build_token(
+    user_id: UserID,
+    agent_id: AgentID,
+    scope,
+    scope_value: str,
+    issued_at: int,
+    expires_at: int
+) -> HushhConsentToken:
+    """Sign the raw token fields and wrap them in the HCT string format validate_token parses."""
     raw = f"{user_id}|{agent_id}|{scope_value}|{issued_at}|{expires_at}"
     signature = _sign(raw)
 
@@ -103,9 +131,10 @@ def is_token_revoked(token_str: str) -> bool:
 
 # ========== Internal Signer ==========
 
+# Keyed once; each signature works on a copy, so the key schedule is never redone
+_signer = hmac.new(SECRET_KEY.encode(), digestmod=hashlib.sha256)
+
 def _sign(input_string: str) -> str:
-    return hmac.new(
-        SECRET_KEY.encode(),
-        input_string.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    signer = _signer.copy()
+    signer.update(input_string.encode())
+    return signer.hexdigest()
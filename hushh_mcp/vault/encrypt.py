@@ -5,6 +5,8 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.exceptions import InvalidTag
 import os
 import base64
+import binascii
+from typing import Union
 from hushh_mcp.types import EncryptedPayload
 
 # ==================== Constants ====================
@@ -12,10 +14,12 @@ from hushh_mcp.types import EncryptedPayload
 IV_LENGTH = 12  # GCM recommended IV size
 TAG_LENGTH = 16
 ALGORITHM_NAME = "aes-256-gcm"
+# update_into needs room for one block beyond the input, even though GCM never uses it
+BUFFER_SLACK = algorithms.AES.block_size // 8 - 1
 
 # ==================== Encrypt ====================
 
-def encrypt_data(plaintext: str, key_hex: str) -> EncryptedPayload:
+def encrypt_data(plaintext: Union[str, bytes], key_hex: str) -> EncryptedPayload:
     try:
         key = bytes.fromhex(key_hex)
         iv = os.urandom(IV_LENGTH)
@@ -24,7 +28,12 @@ def encrypt_data(plaintext: str, key_hex: str) -> EncryptedPayload:
         cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=backend)
         encryptor = cipher.encryptor()
 
-        ciphertext = encryptor.update(plaintext.encode('utf-8')) + encryptor.finalize()
+        # Already-encoded plaintext (e.g. from orjson) is encrypted as-is
+        data = plaintext.encode('utf-8') if isinstance(plaintext, str) else plaintext
+        buffer = bytearray(len(data) + BUFFER_SLACK)
+        written = encryptor.update_into(data, buffer)
+        encryptor.finalize()
+        ciphertext = memoryview(buffer)[:written]
         tag = encryptor.tag
 
         return EncryptedPayload(
@@ -42,16 +51,19 @@ def encrypt_data(plaintext: str, key_hex: str) -> EncryptedPayload:
 def decrypt_data(payload: EncryptedPayload, key_hex: str) -> str:
     try:
         key = bytes.fromhex(key_hex)
-        iv = base64.b64decode(payload.iv)
-        tag = base64.b64decode(payload.tag)
-        ciphertext = base64.b64decode(payload.ciphertext)
+        # a2b_base64 takes the ASCII str as-is; b64decode would first copy it to bytes
+        iv = binascii.a2b_base64(payload.iv)
+        tag = binascii.a2b_base64(payload.tag)
+        ciphertext = binascii.a2b_base64(payload.ciphertext)
 
         backend = default_backend()
         cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=backend)
         decryptor = cipher.decryptor()
 
-        decrypted = decryptor.update(ciphertext) + decryptor.finalize()
-        return decrypted.decode('utf-8')
+        buffer = bytearray(len(ciphertext) + BUFFER_SLACK)
+        written = decryptor.update_into(ciphertext, buffer)
+        decryptor.finalize()
+        return str(memoryview(buffer)[:written], 'utf-8')
 
     except InvalidTag:
         raise ValueError("Decryption failed: Invalid authentication tag. Possible tampering.")
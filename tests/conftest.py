@@ -0,0 +1,21 @@
+"""
+Pytest configuration and fixtures for the MailerPanda memory tests
+"""
+
+import pytest
+
+from agent_helpers import build_mailer_agent
+
+
+def pytest_configure(config):
+    # pytest-xdist registers this marker itself; declare it so serial runs stay warning-free
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): keep tests that share server-side state on one worker under --dist loadgroup"
+    )
+
+
+@pytest.fixture(scope="session")
+def mailer_agent():
+    """Share one agent (LLM client and LangGraph workflow) across the session"""
+    return build_mailer_agent()
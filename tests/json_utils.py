@@ -0,0 +1,29 @@
+"""
+JSON helpers shared by the test scripts: orjson when it is installed, the stdlib otherwise
+"""
+
+import json
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 bytes, compact unless pretty is set."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def pretty(obj) -> str:
+    """Indent a payload for display."""
+    return dumps(obj, pretty=True).decode('utf-8')
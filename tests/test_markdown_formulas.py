@@ -5,7 +5,43 @@ This tests the complete pipeline: PDF processing → formula cleanup → AI form
 """
 
 import requests
-import json
+import re
+
+from json_utils import dumps, loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Markdown formatting elements to look for in the AI response
+MARKDOWN_INDICATORS = {
+    "Headers": ["##", "###"],
+    "Bold Text": ["**"],
+    "Math Code Blocks": ["```math", "```", "$$"],
+    "Equation Numbers": ["**(", ")**"],
+    "Mathematical Symbols": ["∇", "∂", "∑", "α", "β", "γ"],
+    "Proper Structure": ["\n", "L_K", "R_"]
+}
+
+# Longest alternatives first, inside a lookahead so every position is tried
+_ALL_INDICATORS = sorted(
+    {ind for indicators in MARKDOWN_INDICATORS.values() for ind in indicators},
+    key=len, reverse=True
+)
+INDICATOR_PATTERN = re.compile("(?=(" + "|".join(map(re.escape, _ALL_INDICATORS)) + "))")
+
+# A match also implies every shorter indicator it starts with (e.g. "**(" → "**")
+_IMPLIED_INDICATORS = {
+    ind: {other for other in _ALL_INDICATORS if ind.startswith(other)}
+    for ind in _ALL_INDICATORS
+}
+
+def find_markdown_indicators(text):
+    """Return the set of indicators present in text using a single scan."""
+    found = set()
+    for match in INDICATOR_PATTERN.finditer(text):
+        found |= _IMPLIED_INDICATORS[match.group(1)]
+        if len(found) == len(_ALL_INDICATORS):
+            break
+    return found
 
 def test_markdown_formula_formatting():
     """Test the enhanced mathematical formula formatting in Markdown."""
@@ -32,10 +68,10 @@ def test_markdown_formula_formatting():
             "paper_id": paper_id
         }
         
-        response = requests.post(chat_url, json=chat_payload, timeout=30)
+        response = requests.post(chat_url, data=dumps(chat_payload), headers=JSON_HEADERS, timeout=30)
         
         if response.status_code == 200:
-            result = response.json()
+            result = loads(response.content)
             
             if result.get("success"):
                 ai_response = result.get("message", "")
@@ -45,28 +81,22 @@ def test_markdown_formula_formatting():
                 print(ai_response)
                 print("=" * 60)
                 
-                # Check for Markdown formatting elements
-                markdown_indicators = {
-                    "Headers": ["##", "###"],
-                    "Bold Text": ["**"],
-                    "Math Code Blocks": ["```math", "```", "$$"],
-                    "Equation Numbers": ["**(", ")**"],
-                    "Mathematical Symbols": ["∇", "∂", "∑", "α", "β", "γ"],
-                    "Proper Structure": ["\n", "L_K", "R_"]
-                }
+                # Check for Markdown formatting elements in one pass
+                present = find_markdown_indicators(ai_response)
                 
                 print("\n🔍 Markdown Formatting Analysis:")
                 print("-" * 40)
                 
-                for category, indicators in markdown_indicators.items():
-                    found = [ind for ind in indicators if ind in ai_response]
+                passed_categories = 0
+                for category, indicators in MARKDOWN_INDICATORS.items():
+                    found = [ind for ind in indicators if ind in present]
+                    if found:
+                        passed_categories += 1
                     status = "✅" if found else "❌"
                     print(f"{status} {category}: {found if found else 'Not found'}")
                 
                 # Overall assessment
-                total_categories = len(markdown_indicators)
-                passed_categories = sum(1 for _, indicators in markdown_indicators.items() 
-                                      if any(ind in ai_response for ind in indicators))
+                total_categories = len(MARKDOWN_INDICATORS)
                 
                 print(f"\n📊 Overall Score: {passed_categories}/{total_categories} categories passed")
                 
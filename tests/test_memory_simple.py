@@ -5,23 +5,39 @@ This bypasses consent validation to test core memory features.
 """
 
 import os
-import json
-import sys
 from datetime import datetime, timezone
 
-# Add path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), 'hushh_mcp'))
+from json_utils import dumps, loads
 
-def test_memory_with_simple_approach():
+def save_memory(memory_file, memory):
+    """Encrypt a memory dict and write it using the agent's envelope layout."""
+    from hushh_mcp.config import VAULT_ENCRYPTION_KEY
+    from hushh_mcp.vault.encrypt import encrypt_data
+    
+    encrypted = encrypt_data(dumps(memory), VAULT_ENCRYPTION_KEY)
+    with open(memory_file, 'wb') as f:
+        f.write(dumps({
+            'ciphertext': encrypted.ciphertext,
+            'iv': encrypted.iv,
+            'tag': encrypted.tag,
+            'encoding': encrypted.encoding,
+            'algorithm': encrypted.algorithm
+        }))
+
+def append_example(memory, example):
+    """Add an example to the in-process memory; call save_memory to persist it."""
+    memory['email_examples'].append(example)
+    memory['updated_at'] = example['timestamp']
+
+def test_memory_with_simple_approach(mailer_agent):
     """Test memory functionality with a simpler approach."""
     
     print("🧠 Testing MailerPanda Memory Functionality (Simple Approach)")
     print("=" * 70)
     
     try:
-        from hushh_mcp.agents.mailerpanda.index import MassMailerAgent
         from hushh_mcp.config import VAULT_ENCRYPTION_KEY
-        from hushh_mcp.vault.encrypt import encrypt_data, decrypt_data
+        from hushh_mcp.vault.encrypt import decrypt_data
         from hushh_mcp.types import EncryptedPayload
         
         # Create test user directory
@@ -35,12 +51,14 @@ def test_memory_with_simple_approach():
         print("\n🎯 Test 1: Create and Save Memory Data")
         print("-" * 50)
         
+        # One timestamp for the whole memory build
+        now_iso = datetime.now(timezone.utc).isoformat()
         memory_data = {
             'user_id': user_id,
             'agent_id': 'agent_mailerpanda',
             'data_type': 'email_writing_preferences',
-            'created_at': datetime.now(timezone.utc).isoformat(),
-            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'created_at': now_iso,
+            'updated_at': now_iso,
             'preferences': {
                 'writing_style': 'professional',
                 'tone': 'friendly',
@@ -57,7 +75,7 @@ def test_memory_with_simple_approach():
                     'subject': 'Thank You for Your Purchase',
                     'content': 'Dear Customer,\n\nThank you for your recent purchase. We appreciate your business!\n\nBest regards,\nThe Team',
                     'user_input': 'Send a thank you email',
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'timestamp': now_iso,
                     'campaign_id': 'test_001',
                     'user_satisfaction': 'approved'
                 }
@@ -65,7 +83,7 @@ def test_memory_with_simple_approach():
             'feedback_history': [
                 {
                     'feedback': 'Make it more professional and formal',
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'timestamp': now_iso,
                     'campaign_id': 'test_002',
                     'original_input': 'Send a casual update'
                 }
@@ -74,17 +92,8 @@ def test_memory_with_simple_approach():
         }
         
         # Encrypt and save the data
-        encrypted_data = encrypt_data(json.dumps(memory_data), VAULT_ENCRYPTION_KEY)
         memory_file = os.path.join(user_vault_dir, "email_preferences.enc")
-        
-        with open(memory_file, 'w') as f:
-            json.dump({
-                'ciphertext': encrypted_data.ciphertext,
-                'iv': encrypted_data.iv,
-                'tag': encrypted_data.tag,
-                'encoding': encrypted_data.encoding,
-                'algorithm': encrypted_data.algorithm
-            }, f)
+        save_memory(memory_file, memory_data)
         
         print(f"✅ Memory data encrypted and saved: {memory_file}")
         
@@ -92,21 +101,15 @@ def test_memory_with_simple_approach():
         print("\n🎯 Test 2: Load and Decrypt Memory Data")
         print("-" * 50)
         
-        with open(memory_file, 'r') as f:
-            encrypted_file_data = json.load(f)
+        with open(memory_file, 'rb') as f:
+            encrypted_file_data = loads(f.read())
         
         # Reconstruct EncryptedPayload
-        encrypted_payload = EncryptedPayload(
-            ciphertext=encrypted_file_data['ciphertext'],
-            iv=encrypted_file_data['iv'],
-            tag=encrypted_file_data['tag'],
-            encoding=encrypted_file_data['encoding'],
-            algorithm=encrypted_file_data['algorithm']
-        )
+        encrypted_payload = EncryptedPayload.model_validate(encrypted_file_data)
         
         # Decrypt the data
         decrypted_data = decrypt_data(encrypted_payload, VAULT_ENCRYPTION_KEY)
-        loaded_memory = json.loads(decrypted_data)
+        loaded_memory = loads(decrypted_data)
         
         print("✅ Memory data successfully loaded and decrypted!")
         print(f"   👤 User ID: {loaded_memory.get('user_id')}")
@@ -119,9 +122,7 @@ def test_memory_with_simple_approach():
         print("\n🎯 Test 3: Test Style Analysis")
         print("-" * 50)
         
-        # Initialize agent for style analysis
-        agent = MassMailerAgent()
-        style_guide = agent._analyze_user_style_from_memory(loaded_memory)
+        style_guide = mailer_agent._analyze_user_style_from_memory(loaded_memory)
         
         print("✅ Style analysis generated:")
         print(f"   📋 Style Guide: {style_guide}")
@@ -140,20 +141,8 @@ def test_memory_with_simple_approach():
             'user_satisfaction': 'approved'
         }
         
-        loaded_memory['email_examples'].append(new_example)
-        loaded_memory['updated_at'] = datetime.now(timezone.utc).isoformat()
-        
-        # Re-encrypt and save
-        updated_encrypted = encrypt_data(json.dumps(loaded_memory), VAULT_ENCRYPTION_KEY)
-        
-        with open(memory_file, 'w') as f:
-            json.dump({
-                'ciphertext': updated_encrypted.ciphertext,
-                'iv': updated_encrypted.iv,
-                'tag': updated_encrypted.tag,
-                'encoding': updated_encrypted.encoding,
-                'algorithm': updated_encrypted.algorithm
-            }, f)
+        # Only the in-process copy changes here; it is encrypted once at the end
+        append_example(loaded_memory, new_example)
         
         print("✅ New email example added to memory")
         print(f"   📧 Total Examples Now: {len(loaded_memory['email_examples'])}")
@@ -198,6 +187,10 @@ Style Guide: Writing style: {preferences.get('writing_style')} | Tone: {preferen
         print("   4️⃣ More feedback: Learns user likes specific phrases")
         print("   5️⃣ Future emails: Incorporates all learned preferences")
         
+        # Persist every update made since Test 1 with a single encrypt + write
+        save_memory(memory_file, loaded_memory)
+        print(f"\n💾 Memory updates saved: {memory_file}")
+        
         print("\n🎉 Memory Functionality Test Complete!")
         print("   📁 Memory persisted in encrypted vault file")
         print("   🧠 AI can now use this memory for future emails")
@@ -211,4 +204,5 @@ Style Guide: Writing style: {preferences.get('writing_style')} | Tone: {preferen
         traceback.print_exc()
 
 if __name__ == "__main__":
-    test_memory_with_simple_approach()
+    from agent_helpers import build_mailer_agent
+    test_memory_with_simple_approach(build_mailer_agent())
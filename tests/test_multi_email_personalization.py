@@ -3,14 +3,9 @@
 Comprehensive test with multiple emails and diverse contexts
 """
 
-import os
 import sys
 from pathlib import Path
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
-
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
@@ -22,7 +17,7 @@ def generate_multi_email_consent_tokens():
     print("=" * 45)
     
     try:
-        from hushh_mcp.consent.token import issue_token
+        from hushh_mcp.consent.token import issue_tokens
         from hushh_mcp.constants import ConsentScope
         
         user_id = "test_user_multi_email"
@@ -32,8 +27,6 @@ def generate_multi_email_consent_tokens():
         print(f"🤖 Agent ID: {agent_id}")
         
         # Generate all required consent tokens
-        consent_tokens = {}
-        
         required_scopes = [
             ConsentScope.VAULT_READ_EMAIL,
             ConsentScope.CUSTOM_TEMPORARY,
@@ -42,18 +35,16 @@ def generate_multi_email_consent_tokens():
             ConsentScope.VAULT_WRITE_FILE
         ]
         
-        for scope in required_scopes:
-            try:
-                token = issue_token(
-                    user_id=user_id,
-                    agent_id=agent_id,
-                    scope=scope,
-                    expires_in_ms=3600000  # 1 hour
-                )
-                consent_tokens[scope.value] = token.token
-                print(f"✅ Generated token for {scope.value}")
-            except Exception as e:
-                print(f"❌ Failed to generate {scope.value} token: {e}")
+        tokens = issue_tokens(
+            user_id=user_id,
+            agent_id=agent_id,
+            scopes=required_scopes,
+            expires_in_ms=3600000  # 1 hour
+        )
+        scope_values = [scope.value for scope in required_scopes]
+        consent_tokens = dict(zip(scope_values, (token.token for token in tokens)))
+        for scope_value in scope_values:
+            print(f"✅ Generated token for {scope_value}")
         
         print(f"\n🎯 Total tokens generated: {len(consent_tokens)}")
         return consent_tokens, user_id
@@ -62,7 +53,7 @@ def generate_multi_email_consent_tokens():
         print(f"❌ Token generation error: {e}")
         return {}, None
 
-def test_multi_email_personalization():
+def test_multi_email_personalization(mailer_agent):
     """Test personalization with multiple diverse email contexts."""
     
     print(f"\n🎯 Testing Multi-Email Personalization")
@@ -76,18 +67,7 @@ def test_multi_email_personalization():
         return False
     
     try:
-        from hushh_mcp.agents.mailerpanda.index import MassMailerAgent
-        
-        # Get API keys from environment
-        api_keys = {
-            'google_api_key': os.environ.get('GOOGLE_API_KEY'),
-            'mailjet_api_key': os.environ.get('MAILJET_API_KEY'),
-            'mailjet_api_secret': os.environ.get('MAILJET_API_SECRET')
-        }
-        
-        print(f"\n🚀 Initializing MailerPanda agent...")
-        agent = MassMailerAgent(api_keys=api_keys)
-        print(f"✅ Agent initialized successfully!")
+        agent = mailer_agent
         
         # Diverse user input for different email contexts
         user_input = """
@@ -208,6 +188,9 @@ def show_test_context():
     """)
 
 if __name__ == "__main__":
+    # Importing agent_helpers also loads the environment variables
+    from agent_helpers import build_mailer_agent
+    
     print("🚀 Multi-Email Personalization Test")
     print("=" * 50)
     
@@ -215,7 +198,7 @@ if __name__ == "__main__":
     show_test_context()
     
     # Run the comprehensive test
-    result = test_multi_email_personalization()
+    result = test_multi_email_personalization(build_mailer_agent())
     
     if result:
         print(f"\n🎉 Multi-email test completed!")
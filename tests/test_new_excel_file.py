@@ -3,34 +3,27 @@
 Direct test with the new multi_email_test.xlsx file
 """
 
-import os
 import sys
 from pathlib import Path
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
-
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-def test_new_multi_email_file():
+def test_new_multi_email_file(mailer_agent):
     """Test directly with the new multi_email_test.xlsx file."""
     
     print("🎯 Testing New Multi-Email Excel File")
     print("=" * 45)
     
     try:
-        from hushh_mcp.consent.token import issue_token
+        from hushh_mcp.consent.token import issue_tokens
         from hushh_mcp.constants import ConsentScope
-        from hushh_mcp.agents.mailerpanda.index import MassMailerAgent
         
         # Generate consent tokens
         user_id = "test_user_new_file"
         agent_id = "agent_mailerpanda"
         
-        consent_tokens = {}
         required_scopes = [
             ConsentScope.VAULT_READ_EMAIL,
             ConsentScope.CUSTOM_TEMPORARY,
@@ -40,32 +33,32 @@ def test_new_multi_email_file():
         ]
         
         print("🔐 Generating consent tokens...")
-        for scope in required_scopes:
-            token = issue_token(user_id=user_id, agent_id=agent_id, scope=scope, expires_in_ms=3600000)
-            consent_tokens[scope.value] = token.token
-            print(f"✅ {scope.value}")
-        
-        # Get API keys
-        api_keys = {
-            'google_api_key': os.environ.get('GOOGLE_API_KEY'),
-            'mailjet_api_key': os.environ.get('MAILJET_API_KEY'),
-            'mailjet_api_secret': os.environ.get('MAILJET_API_SECRET')
-        }
+        tokens = issue_tokens(user_id=user_id, agent_id=agent_id, scopes=required_scopes, expires_in_ms=3600000)
+        scope_values = [scope.value for scope in required_scopes]
+        consent_tokens = dict(zip(scope_values, (token.token for token in tokens)))
+        for scope_value in scope_values:
+            print(f"✅ {scope_value}")
         
-        print(f"\n🚀 Initializing MailerPanda...")
-        agent = MassMailerAgent(api_keys=api_keys)
+        agent = mailer_agent
         
         # Test with the new Excel file specifically
         excel_file_path = "hushh_mcp/agents/mailerpanda/multi_email_test.xlsx"
         
         print(f"\n📁 Using Excel file: {excel_file_path}")
         
-        # Verify the file exists and show contents
-        import pandas as pd
-        df = pd.read_excel(excel_file_path)
-        print(f"📊 File contains {len(df)} recipients:")
-        for i, row in df.iterrows():
-            print(f"  {i+1}. {row['name']} ({row['email']}) - {row['description'][:50]}...")
+        # Verify the file exists and show contents, streaming the rows
+        from openpyxl import load_workbook
+        workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows)
+            name_col, email_col, description_col = (header.index(column) for column in ('name', 'email', 'description'))
+            recipients = [row for row in rows if any(cell is not None for cell in row)]
+        finally:
+            workbook.close()
+        print(f"📊 File contains {len(recipients)} recipients:")
+        for i, row in enumerate(recipients, 1):
+            print(f"  {i}. {row[name_col]} ({row[email_col]}) - {row[description_col][:50]}...")
         
         user_input = """
         Send personalized emails about our AI email platform.
@@ -103,10 +96,13 @@ def test_new_multi_email_file():
         return None
 
 if __name__ == "__main__":
+    # Importing agent_helpers also loads the environment variables
+    from agent_helpers import build_mailer_agent
+    
     print("🚀 Direct Multi-Email Test")
     print("=" * 30)
     
-    result = test_new_multi_email_file()
+    result = test_new_multi_email_file(build_mailer_agent())
     
     if result:
         print(f"\n✅ Test completed with status: {result.get('status')}")
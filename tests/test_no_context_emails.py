@@ -22,7 +22,7 @@ def generate_no_context_consent_tokens():
     print("=" * 50)
     
     try:
-        from hushh_mcp.consent.token import issue_token
+        from agent_helpers import issue_consent_tokens
         from hushh_mcp.constants import ConsentScope
         
         user_id = "test_user_no_context"
@@ -31,29 +31,18 @@ def generate_no_context_consent_tokens():
         print(f"👤 User ID: {user_id}")
         print(f"🤖 Agent ID: {agent_id}")
         
-        # Generate all required consent tokens
-        consent_tokens = {}
-        
-        required_scopes = [
+        # Generate all required consent tokens; they last an hour and are signed once per run
+        required_scopes = (
             ConsentScope.VAULT_READ_EMAIL,
             ConsentScope.CUSTOM_TEMPORARY,
             ConsentScope.VAULT_WRITE_EMAIL,
             ConsentScope.VAULT_READ_FILE,
             ConsentScope.VAULT_WRITE_FILE
-        ]
-        
-        for scope in required_scopes:
-            try:
-                token = issue_token(
-                    user_id=user_id,
-                    agent_id=agent_id,
-                    scope=scope,
-                    expires_in_ms=3600000  # 1 hour
-                )
-                consent_tokens[scope.value] = token.token
-                print(f"✅ Generated token for {scope.value}")
-            except Exception as e:
-                print(f"❌ Failed to generate {scope.value} token: {e}")
+        )
+        
+        consent_tokens = dict(issue_consent_tokens(user_id, agent_id, required_scopes))
+        for scope_value in consent_tokens:
+            print(f"✅ Generated token for {scope_value}")
         
         print(f"\n🎯 Total tokens generated: {len(consent_tokens)}")
         return consent_tokens, user_id
@@ -172,10 +161,9 @@ def test_no_context_emails():
             return result
             
     except Exception as e:
-        print(f"❌ Test Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return None
+        print(f"❌ Test Error: {type(e).__name__}: {e}")
+        # Re-raise so pytest (or the interpreter, when run as a script) shows the full traceback
+        raise
 
 def show_comparison_info():
     """Show comparison between context vs no-context testing."""
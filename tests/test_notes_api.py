@@ -3,57 +3,88 @@
 Simple test to check the notes API and fix chronological order.
 """
 
-import requests
-import json
+import asyncio
+import httpx
+from pathlib import Path
+
+# Remembers the last endpoint that answered 200 so later runs try it first
+CACHE = Path(__file__).parent / ".cache" / "notes_endpoint"
+
+async def probe(client, endpoint):
+    """GET one candidate endpoint, returning its response or the error."""
+    try:
+        return await client.get(endpoint)
+    except Exception as e:
+        return e
 
 def test_and_fix_notes():
     """Test notes API and fix order if possible."""
-    
+    asyncio.run(check_notes_endpoints())
+
+async def check_notes_endpoints():
+    """Probe every candidate notes endpoint at once, then fall back to the chat API."""
+
     print("🔍 Testing Notes API...")
-    
+
     # Try different API endpoints
     base_url = "http://localhost:8001"
-    
+
     endpoints_to_try = [
         f"{base_url}/research/notes",
         f"{base_url}/notes",
         f"{base_url}/research/notes/AI%20Responses",
         f"{base_url}/api/notes/AI%20Responses"
     ]
-    
-    for endpoint in endpoints_to_try:
-        try:
+
+    cached = CACHE.read_text().strip() if CACHE.exists() else None
+
+    # Every probe and the chat check go to the same host, so share one client
+    async with httpx.AsyncClient(timeout=10) as client:
+        # A previously working endpoint usually still works; skip discovery if it does
+        if cached:
+            print(f"📡 Trying cached: {cached}")
+            result = await probe(client, cached)
+            if not isinstance(result, Exception) and result.status_code == 200:
+                print(f"   ✅ Success! Cached endpoint still works")
+                return
+            print(f"   ❌ Cached endpoint failed, probing all endpoints")
+
+        # All probes race; a dead server costs one timeout, not one per endpoint
+        results = await asyncio.gather(*(probe(client, endpoint) for endpoint in endpoints_to_try))
+
+        for endpoint, result in zip(endpoints_to_try, results):
             print(f"📡 Trying: {endpoint}")
-            response = requests.get(endpoint, timeout=10)
-            print(f"   Status: {response.status_code}")
-            
-            if response.status_code == 200:
+            if isinstance(result, Exception):
+                print(f"   ❌ Error: {result}")
+                continue
+            print(f"   Status: {result.status_code}")
+
+            if result.status_code == 200:
                 print(f"   ✅ Success! Found working endpoint")
+                CACHE.parent.mkdir(parents=True, exist_ok=True)
+                CACHE.write_text(endpoint)
                 return
-                
+
+        print("\n🤔 Let me try a different approach...")
+
+        # Try the research agent chat API to see if backend is working
+        try:
+            chat_url = f"{base_url}/research/chat"
+            test_payload = {
+                "message": "test",
+                "paper_id": "test"
+            }
+
+            response = await client.post(chat_url, json=test_payload)
+            print(f"📡 Chat API test: {response.status_code}")
+
+            if response.status_code == 200:
+                print("✅ Backend is working! The issue might be with the notes endpoint.")
+            else:
+                print("❌ Backend might not be fully operational.")
+
         except Exception as e:
-            print(f"   ❌ Error: {e}")
-    
-    print("\n🤔 Let me try a different approach...")
-    
-    # Try the research agent chat API to see if backend is working
-    try:
-        chat_url = f"{base_url}/research/chat"
-        test_payload = {
-            "message": "test",
-            "paper_id": "test"
-        }
-        
-        response = requests.post(chat_url, json=test_payload, timeout=10)
-        print(f"📡 Chat API test: {response.status_code}")
-        
-        if response.status_code == 200:
-            print("✅ Backend is working! The issue might be with the notes endpoint.")
-        else:
-            print("❌ Backend might not be fully operational.")
-            
-    except Exception as e:
-        print(f"❌ Backend connection error: {e}")
+            print(f"❌ Backend connection error: {e}")
 
 if __name__ == "__main__":
     test_and_fix_notes()
@@ -10,12 +10,9 @@ of any agent logic to ensure accurate calculations.
 
 import pytest
 import json
+import logging
+import numpy as np
 from datetime import datetime
-import sys
-import os
-
-# Add project root to Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from hushh_mcp.operons.financial_modeling import (
     build_three_statement_model,
@@ -27,55 +24,123 @@ from hushh_mcp.operons.financial_modeling import (
     FinancialModelingError
 )
 
+# Progress output; shown with --log-cli-level=DEBUG
+logger = logging.getLogger(__name__)
+
+
+# Fixture data, built once at import; no operon mutates its inputs
+_SAMPLE_FIN_DATA = {
+    'ticker': 'TEST',
+    'company_name': 'Test Corporation',
+    'income_statements': [
+        {
+            'year': 2021,
+            'revenue': 1000000000,
+            'operating_income': 200000000,
+            'ebitda': 250000000,
+            'net_income': 150000000
+        },
+        {
+            'year': 2022,
+            'revenue': 1100000000,
+            'operating_income': 220000000,
+            'ebitda': 275000000,
+            'net_income': 165000000
+        },
+        {
+            'year': 2023,
+            'revenue': 1200000000,
+            'operating_income': 240000000,
+            'ebitda': 300000000,
+            'net_income': 180000000
+        }
+    ],
+    'balance_sheets': [
+        {
+            'year': 2023,
+            'total_assets': 2000000000,
+            'total_debt': 500000000,
+            'shareholders_equity': 1200000000
+        }
+    ],
+    'cash_flows': [
+        {
+            'year': 2023,
+            'operating_cash_flow': 220000000,
+            'capex': -50000000,
+            'free_cash_flow': 170000000
+        }
+    ]
+}
+
+_COMPLETE_WORKFLOW_DATA = {
+    'ticker': 'AAPL',
+    'company_name': 'Apple Inc.',
+    'income_statements': [
+        {
+            'year': 2021,
+            'revenue': 365817000000,
+            'operating_income': 108949000000,
+            'ebitda': 123136000000,
+            'net_income': 94680000000
+        },
+        {
+            'year': 2022,
+            'revenue': 394328000000,
+            'operating_income': 119437000000,
+            'ebitda': 130541000000,
+            'net_income': 99803000000
+        },
+        {
+            'year': 2023,
+            'revenue': 383285000000,
+            'operating_income': 114301000000,
+            'ebitda': 125820000000,
+            'net_income': 96995000000
+        }
+    ],
+    'balance_sheets': [
+        {
+            'year': 2023,
+            'total_assets': 352755000000,
+            'total_debt': 123930000000,
+            'shareholders_equity': 62146000000
+        }
+    ],
+    'cash_flows': [
+        {
+            'year': 2023,
+            'operating_cash_flow': 110543000000,
+            'capex': -10959000000,
+            'free_cash_flow': 99584000000
+        }
+    ]
+}
+
 
 class TestFinancialModeling:
     """Test cases for financial modeling operons."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_financial_data(self):
         """Sample financial data for testing."""
+        return _SAMPLE_FIN_DATA
+    
+    @pytest.fixture(scope="session")
+    def sample_forecasts(self, sample_financial_data):
+        """Five-year forecasts built once from the sample data; no operon mutates them."""
+        return build_three_statement_model(sample_financial_data)
+    
+    @pytest.fixture(scope="session")
+    def sample_base_dcf(self, sample_forecasts):
+        """Base-case DCF (10% WACC, 2.5% terminal growth) shared by the DCF-dependent tests."""
+        return perform_dcf_analysis(sample_forecasts, 0.10, 0.025)
+    
+    @pytest.fixture(scope="session")
+    def forecast_arrays(self, sample_forecasts):
+        """Forecast horizon as NumPy columns, converted once for vectorized checks."""
         return {
-            'ticker': 'TEST',
-            'company_name': 'Test Corporation',
-            'income_statements': [
-                {
-                    'year': 2021,
-                    'revenue': 1000000000,
-                    'operating_income': 200000000,
-                    'ebitda': 250000000,
-                    'net_income': 150000000
-                },
-                {
-                    'year': 2022,
-                    'revenue': 1100000000,
-                    'operating_income': 220000000,
-                    'ebitda': 275000000,
-                    'net_income': 165000000
-                },
-                {
-                    'year': 2023,
-                    'revenue': 1200000000,
-                    'operating_income': 240000000,
-                    'ebitda': 300000000,
-                    'net_income': 180000000
-                }
-            ],
-            'balance_sheets': [
-                {
-                    'year': 2023,
-                    'total_assets': 2000000000,
-                    'total_debt': 500000000,
-                    'shareholders_equity': 1200000000
-                }
-            ],
-            'cash_flows': [
-                {
-                    'year': 2023,
-                    'operating_cash_flow': 220000000,
-                    'capex': -50000000,
-                    'free_cash_flow': 170000000
-                }
-            ]
+            'revenue': np.array([stmt['revenue'] for stmt in sample_forecasts['income_statements']])
         }
     
     def test_validate_financial_data_valid(self, sample_financial_data):
@@ -90,9 +155,9 @@ class TestFinancialModeling:
         invalid_data2 = {}  # Empty data
         assert validate_financial_data(invalid_data2) == False
     
-    def test_build_three_statement_model(self, sample_financial_data):
+    def test_build_three_statement_model(self, sample_forecasts, forecast_arrays):
         """Test three-statement model building."""
-        forecasts = build_three_statement_model(sample_financial_data)
+        forecasts = sample_forecasts
         
         # Check structure
         assert 'income_statements' in forecasts
@@ -106,9 +171,7 @@ class TestFinancialModeling:
         assert len(forecasts['cash_flows']) == 5
         
         # Check that revenues are growing
-        revenues = [stmt['revenue'] for stmt in forecasts['income_statements']]
-        for i in range(1, len(revenues)):
-            assert revenues[i] > revenues[i-1], "Revenue should be growing"
+        assert np.all(np.diff(forecast_arrays['revenue']) > 0), "Revenue should be growing"
         
         # Check that free cash flows are calculated
         for cf in forecasts['cash_flows']:
@@ -126,13 +189,12 @@ class TestFinancialModeling:
         with pytest.raises(FinancialModelingError):
             build_three_statement_model(insufficient_data)
     
-    def test_perform_dcf_analysis(self, sample_financial_data):
+    def test_perform_dcf_analysis(self, sample_base_dcf):
         """Test DCF analysis calculation."""
-        forecasts = build_three_statement_model(sample_financial_data)
         wacc = 0.10
         terminal_growth = 0.025
         
-        dcf_results = perform_dcf_analysis(forecasts, wacc, terminal_growth)
+        dcf_results = sample_base_dcf
         
         # Check structure
         required_fields = [
@@ -148,7 +210,7 @@ class TestFinancialModeling:
         assert dcf_results['intrinsic_value_per_share'] > 0
         
         # Check that enterprise value equals sum of PV components
-        pv_fcf_sum = sum(dcf_results['present_value_fcf'])
+        pv_fcf_sum = float(np.asarray(dcf_results['present_value_fcf']).sum())
         expected_ev = pv_fcf_sum + dcf_results['pv_terminal_value']
         assert abs(dcf_results['enterprise_value'] - expected_ev) < 0.01
         
@@ -163,40 +225,22 @@ class TestFinancialModeling:
         with pytest.raises(FinancialModelingError):
             perform_dcf_analysis(empty_forecasts, 0.10, 0.025)
     
-    def test_generate_recommendation_buy(self):
-        """Test buy recommendation generation."""
-        market_price = 80.0
-        intrinsic_value = 100.0
-        
+    @pytest.mark.parametrize("market_price,intrinsic_value,expected,upside_check", [
+        (80.0, 100.0, 'BUY', lambda upside: upside > 0.15),        # Should be > 15%
+        (120.0, 100.0, 'SELL', lambda upside: upside < -0.15),     # Should be < -15%
+        (102.0, 100.0, 'HOLD', lambda upside: abs(upside) <= 0.15)  # Should be within ±15%
+    ], ids=['buy', 'sell', 'hold'])
+    def test_generate_recommendation(self, market_price, intrinsic_value, expected, upside_check):
+        """Test buy/sell/hold recommendation generation."""
         recommendation = generate_recommendation(market_price, intrinsic_value)
         
-        assert recommendation['recommendation'] == 'BUY'
+        assert recommendation['recommendation'] == expected
+        assert upside_check(recommendation['upside_potential'])
         assert recommendation['market_price'] == market_price
         assert recommendation['intrinsic_value'] == intrinsic_value
-        assert recommendation['upside_potential'] > 0.15  # Should be > 15%
         assert 'rationale' in recommendation
         assert 'confidence_score' in recommendation
     
-    def test_generate_recommendation_sell(self):
-        """Test sell recommendation generation."""
-        market_price = 120.0
-        intrinsic_value = 100.0
-        
-        recommendation = generate_recommendation(market_price, intrinsic_value)
-        
-        assert recommendation['recommendation'] == 'SELL'
-        assert recommendation['upside_potential'] < -0.15  # Should be < -15%
-    
-    def test_generate_recommendation_hold(self):
-        """Test hold recommendation generation."""
-        market_price = 102.0
-        intrinsic_value = 100.0
-        
-        recommendation = generate_recommendation(market_price, intrinsic_value)
-        
-        assert recommendation['recommendation'] == 'HOLD'
-        assert abs(recommendation['upside_potential']) <= 0.15  # Should be within ±15%
-    
     def test_generate_recommendation_invalid_prices(self):
         """Test recommendation with invalid prices."""
         with pytest.raises(FinancialModelingError):
@@ -205,16 +249,13 @@ class TestFinancialModeling:
         with pytest.raises(FinancialModelingError):
             generate_recommendation(100, -50)  # Negative intrinsic value
     
-    def test_calculate_sensitivity_analysis(self, sample_financial_data):
+    def test_calculate_sensitivity_analysis(self, sample_forecasts, sample_base_dcf):
         """Test sensitivity analysis calculation."""
-        forecasts = build_three_statement_model(sample_financial_data)
-        base_dcf = perform_dcf_analysis(forecasts, 0.10, 0.025)
-        
         wacc_range = (0.08, 0.12)
         growth_range = (0.02, 0.03)
         
         sensitivity = calculate_sensitivity_analysis(
-            base_dcf, wacc_range, growth_range, forecasts
+            sample_base_dcf, wacc_range, growth_range, sample_forecasts
         )
         
         # Check structure
@@ -225,18 +266,32 @@ class TestFinancialModeling:
         assert 'max_value' in sensitivity
         
         # Check matrix dimensions (should be 5x5)
-        assert len(sensitivity['sensitivity_matrix']) == 5
-        assert all(len(row) == 5 for row in sensitivity['sensitivity_matrix'])
+        matrix = np.asarray(sensitivity['sensitivity_matrix'], dtype=np.float64)
+        assert matrix.shape == (5, 5)
         
         # Check that min and max values are correctly calculated
-        all_values = [val for row in sensitivity['sensitivity_matrix'] for val in row]
-        assert sensitivity['min_value'] == min(all_values)
-        assert sensitivity['max_value'] == max(all_values)
+        assert sensitivity['min_value'] == matrix.min()
+        assert sensitivity['max_value'] == matrix.max()
     
-    def test_format_valuation_report(self, sample_financial_data):
+    def test_sensitivity_matrix_matches_per_cell_dcf(self, sample_forecasts, sample_base_dcf):
+        """Each cell of the 5x5 grid is the DCF value at that WACC/growth pair."""
+        sensitivity = calculate_sensitivity_analysis(
+            sample_base_dcf, (0.08, 0.12), (0.02, 0.03), sample_forecasts
+        )
+        
+        expected = np.array([
+            [perform_dcf_analysis(sample_forecasts, wacc, growth)['intrinsic_value_per_share']
+             for growth in np.linspace(0.02, 0.03, 5)]
+            for wacc in np.linspace(0.08, 0.12, 5)
+        ])
+        
+        matrix = np.asarray(sensitivity['sensitivity_matrix'], dtype=np.float64)
+        assert np.allclose(matrix, expected, rtol=0, atol=0.011)
+        assert sensitivity['base_case_value'] == sample_base_dcf['intrinsic_value_per_share']
+    
+    def test_format_valuation_report(self, sample_base_dcf):
         """Test valuation report formatting."""
-        forecasts = build_three_statement_model(sample_financial_data)
-        dcf_results = perform_dcf_analysis(forecasts, 0.10, 0.025)
+        dcf_results = sample_base_dcf
         recommendation = generate_recommendation(100.0, dcf_results['intrinsic_value_per_share'])
         
         report = format_valuation_report(dcf_results, recommendation)
@@ -258,13 +313,12 @@ class TestFinancialModeling:
         assert metadata['analyst'] == 'Chandu Finance Agent'
         assert metadata['methodology'] == 'Discounted Cash Flow (DCF) Analysis'
     
-    def test_format_valuation_report_with_sensitivity(self, sample_financial_data):
+    def test_format_valuation_report_with_sensitivity(self, sample_forecasts, sample_base_dcf):
         """Test valuation report with sensitivity analysis."""
-        forecasts = build_three_statement_model(sample_financial_data)
-        dcf_results = perform_dcf_analysis(forecasts, 0.10, 0.025)
+        dcf_results = sample_base_dcf
         recommendation = generate_recommendation(100.0, dcf_results['intrinsic_value_per_share'])
         sensitivity = calculate_sensitivity_analysis(
-            dcf_results, (0.08, 0.12), (0.02, 0.03), forecasts
+            dcf_results, (0.08, 0.12), (0.02, 0.03), sample_forecasts
         )
         
         report = format_valuation_report(dcf_results, recommendation, sensitivity)
@@ -276,52 +330,10 @@ class TestFinancialModeling:
 class TestFinancialModelingIntegration:
     """Integration tests for the complete financial modeling workflow."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def complete_workflow_data(self):
         """Complete data for workflow testing."""
-        return {
-            'ticker': 'AAPL',
-            'company_name': 'Apple Inc.',
-            'income_statements': [
-                {
-                    'year': 2021,
-                    'revenue': 365817000000,
-                    'operating_income': 108949000000,
-                    'ebitda': 123136000000,
-                    'net_income': 94680000000
-                },
-                {
-                    'year': 2022,
-                    'revenue': 394328000000,
-                    'operating_income': 119437000000,
-                    'ebitda': 130541000000,
-                    'net_income': 99803000000
-                },
-                {
-                    'year': 2023,
-                    'revenue': 383285000000,
-                    'operating_income': 114301000000,
-                    'ebitda': 125820000000,
-                    'net_income': 96995000000
-                }
-            ],
-            'balance_sheets': [
-                {
-                    'year': 2023,
-                    'total_assets': 352755000000,
-                    'total_debt': 123930000000,
-                    'shareholders_equity': 62146000000
-                }
-            ],
-            'cash_flows': [
-                {
-                    'year': 2023,
-                    'operating_cash_flow': 110543000000,
-                    'capex': -10959000000,
-                    'free_cash_flow': 99584000000
-                }
-            ]
-        }
+        return _COMPLETE_WORKFLOW_DATA
     
     def test_complete_valuation_workflow(self, complete_workflow_data):
         """Test the complete valuation workflow."""
@@ -351,10 +363,10 @@ class TestFinancialModelingIntegration:
         )
         assert 'sensitivity_matrix' in sensitivity
         
-        print(f"✅ Complete workflow test passed!")
-        print(f"   Intrinsic Value: ${dcf_results['intrinsic_value_per_share']:.2f}")
-        print(f"   Market Price: ${market_price:.2f}")
-        print(f"   Recommendation: {recommendation['recommendation']}")
+        logger.debug(
+            "✅ Complete workflow test passed! Intrinsic Value: $%.2f, Market Price: $%.2f, Recommendation: %s",
+            dcf_results['intrinsic_value_per_share'], market_price, recommendation['recommendation']
+        )
 
 
 if __name__ == "__main__":
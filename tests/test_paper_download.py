@@ -3,21 +3,27 @@
 Test script to verify that paper downloading works correctly
 """
 import asyncio
-import sys
-import os
-
-# Add the project root to the path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import logging
 
 from hushh_mcp.agents.research_agent.index import research_agent
 
-async def test_paper_download():
-    """Test downloading and processing a paper with slashes in the ID"""
+# Progress is logged at debug level (shown with --log-cli-level=DEBUG, or always
+# when run as a script); failures are logged as errors
+logger = logging.getLogger(__name__)
+
+# Papers to download; old-style IDs contain slashes
+PAPER_IDS = ["gr-qc/0606081v1"]
+
+async def test_paper_download(paper_ids=PAPER_IDS):
+    """Test downloading and processing papers, including IDs with slashes"""
     
-    print("🧪 Testing paper download functionality...")
+    logger.debug("🧪 Testing paper download functionality...")
     
-    # Test paper with slashes in ID
-    paper_id = "gr-qc/0606081v1"
+    # Downloads are network-bound, so every paper is fetched at once
+    await asyncio.gather(*(check_paper_download(paper_id) for paper_id in paper_ids))
+
+async def check_paper_download(paper_id: str):
+    """Download, process and chat about one paper."""
     user_id = "test_user"
     consent_tokens = {
         "custom.temporary": "test_token",
@@ -27,7 +33,7 @@ async def test_paper_download():
     
     message = "Can you provide a summary of the introduction section?"
     
-    print(f"📄 Testing with paper ID: {paper_id}")
+    logger.debug("📄 Testing with paper ID: %s", paper_id)
     
     try:
         result = await research_agent.chat_about_paper(
@@ -38,20 +44,22 @@ async def test_paper_download():
         )
         
         if result["success"]:
-            print("✅ SUCCESS: Paper download and processing worked!")
-            print(f"📝 AI Response: {result['response'][:200]}...")
+            logger.debug("✅ SUCCESS: Paper download and processing worked!")
+            logger.debug("📝 AI Response: %.200s...", result['response'])
             
             # Check if full content was accessed
             if "full paper content" in result['response'].lower() or len(result['response']) > 500:
-                print("🎉 FULL CONTENT ACCESS CONFIRMED!")
+                logger.debug("🎉 FULL CONTENT ACCESS CONFIRMED!")
             else:
-                print("⚠️  May still be using abstract only")
+                logger.debug("⚠️  May still be using abstract only")
                 
         else:
-            print(f"❌ FAILED: {result.get('error', 'Unknown error')}")
+            logger.error("❌ FAILED: %s", result.get('error', 'Unknown error'))
             
-    except Exception as e:
-        print(f"💥 ERROR: {e}")
+    except Exception:
+        logger.exception("💥 ERROR while checking paper %s", paper_id)
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG)
     asyncio.run(test_paper_download())
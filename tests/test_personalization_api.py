@@ -3,14 +3,29 @@
 Test script for MailerPanda API personalization feature
 """
 
-import requests
-import json
+import asyncio
+import httpx
 from datetime import datetime
 
+from json_utils import dumps, loads, pretty
+
 # API endpoint
 API_BASE = "http://localhost:8002"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def test_personalization_api():
+    """Run the agent info and personalization checks against the API."""
+    asyncio.run(run_checks())
 
-def test_mailerpanda_personalization():
+async def run_checks():
+    """Run both checks at once; the LLM-backed execute call dominates, so /agents rides along for free."""
+    async with httpx.AsyncClient(base_url=API_BASE, timeout=60) as client:
+        await asyncio.gather(
+            check_agent_info(client),
+            check_mailerpanda_personalization(client)
+        )
+
+async def check_mailerpanda_personalization(client: httpx.AsyncClient):
     """Test the MailerPanda API with personalization enabled."""
     
     # Test data
@@ -31,22 +46,18 @@ def test_mailerpanda_personalization():
     }
     
     print("🧪 Testing MailerPanda API with Personalization...")
-    print(f"📊 Request Data: {json.dumps(test_request, indent=2)}")
+    print(f"📊 Request Data: {pretty(test_request)}")
     
     try:
         # Test the API endpoint
-        response = requests.post(
-            f"{API_BASE}/agents/mailerpanda/execute",
-            json=test_request,
-            headers={"Content-Type": "application/json"}
-        )
+        response = await client.post("/agents/mailerpanda/execute", content=dumps(test_request), headers=JSON_HEADERS)
         
         print(f"📡 Response Status: {response.status_code}")
         
         if response.status_code == 200:
-            response_data = response.json()
+            response_data = loads(response.content)
             print("✅ API Response:")
-            print(json.dumps(response_data, indent=2))
+            print(pretty(response_data))
             
             # Check for personalization fields
             if "personalized_count" in response_data:
@@ -60,22 +71,22 @@ def test_mailerpanda_personalization():
             print(f"❌ API Error: {response.status_code}")
             print(f"Error Details: {response.text}")
             
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("🔌 Connection Error: Make sure the API server is running")
         print("💡 Start the server with: python api.py")
     except Exception as e:
         print(f"❌ Test Error: {str(e)}")
 
-def test_agent_info():
+async def check_agent_info(client: httpx.AsyncClient):
     """Test the agent info endpoint for updated MailerPanda details."""
     
     print("\n🔍 Testing Agent Info Endpoint...")
     
     try:
-        response = requests.get(f"{API_BASE}/agents")
+        response = await client.get("/agents")
         
         if response.status_code == 200:
-            agents_data = response.json()
+            agents_data = loads(response.content)
             mailerpanda = agents_data.get("agent_mailerpanda", {})
             
             print("📋 MailerPanda Agent Info:")
@@ -100,8 +111,7 @@ if __name__ == "__main__":
     print("🚀 MailerPanda Personalization API Test")
     print("=" * 50)
     
-    test_agent_info()
-    test_mailerpanda_personalization()
+    test_personalization_api()
     
     print("\n✅ Test completed!")
     print("💡 If the server isn't running, start it with: python api.py")
@@ -3,17 +3,13 @@
 Test script to verify the placeholder replacement fix in MailerPanda agent.
 """
 
-import os
 import sys
-import pandas as pd
+from pathlib import Path
 
 # Add the project root to the path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-class SafeDict(dict):
-    """Custom dict that handles missing placeholders gracefully."""
-    def __missing__(self, key):
-        return "{" + key + "}"
+from hushh_mcp.agents.mailerpanda.index import compile_template, personalize, render_template
 
 def test_placeholder_replacement():
     """Test that placeholders are properly replaced with contact data."""
@@ -48,10 +44,9 @@ The MailerPanda Team"""
     print("\n👤 Contact Data:")
     print(contact_data)
     
-    # Apply the fix - use SafeDict for placeholder replacement
-    safe_contact = SafeDict(contact_data)
-    personalized_subject = subject_with_placeholders.format_map(safe_contact)
-    personalized_content = template_with_placeholders.format_map(safe_contact)
+    # Apply the fix - fill placeholders from the contact data
+    personalized_subject = personalize(subject_with_placeholders, contact_data)
+    personalized_content = personalize(template_with_placeholders, contact_data)
     
     print("\n✅ AFTER FIX:")
     print("\n📌 Personalized Subject:")
@@ -86,8 +81,7 @@ def test_missing_placeholder():
     print("\n👤 Contact Data (missing 'description'):")
     print(contact_data)
     
-    safe_contact = SafeDict(contact_data)
-    result = template.format_map(safe_contact)
+    result = personalize(template, contact_data)
     
     print("\n✅ Result:")
     print(result)
@@ -101,6 +95,26 @@ def test_missing_placeholder():
         print(f"\n❌ FAILURE: Expected '{expected}', got '{result}'")
         return False
 
+def test_bulk_render_matches_format_map():
+    """A template compiled once renders 10k contacts exactly like the old format_map path."""
+    
+    class SafeDict(dict):
+        """The previous per-contact placeholder handling, kept as the reference."""
+        def __missing__(self, key):
+            return "{" + key + "}"
+    
+    template = "Hi {name} at {company_name}, about {description}: {unknown} stays put."
+    contacts = [
+        {'name': f'Contact {i}', 'company_name': f'Company {i % 97}', 'description': f'interest #{i}'}
+        for i in range(10_000)
+    ]
+    
+    parts = compile_template(template)
+    assert all(
+        render_template(parts, contact) == template.format_map(SafeDict(contact))
+        for contact in contacts
+    )
+
 if __name__ == "__main__":
     print("🚀 MailerPanda Placeholder Fix Test")
     print("=" * 60)
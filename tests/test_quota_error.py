@@ -2,11 +2,22 @@
 """
 Test script to reproduce the Google API quota error
 """
+import logging
 import requests
-import json
+
+from json_utils import dumps, loads
+
+# Progress is logged at debug level (shown with --log-cli-level=DEBUG, or always
+# when run as a script); failures are logged as errors
+logger = logging.getLogger(__name__)
+
+# Reuses its connection pool when the request is repeated in the same process
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 # Test minimal request to reproduce the quota error
-test_request = {
+TEST_REQUEST = {
     "user_id": "test_user",
     "user_input": "Create a welcome email for new subscribers",
     "consent_tokens": {
@@ -24,25 +35,31 @@ test_request = {
     "excel_file_name": ""
 }
 
-try:
-    print("🧪 Testing mass-email endpoint...")
-    response = requests.post(
-        'http://127.0.0.1:8001/agents/mailerpanda/mass-email',
-        headers={'Content-Type': 'application/json'},
-        json=test_request,
-        timeout=60
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    print(f"Response Headers: {dict(response.headers)}")
-    
-    if response.status_code == 200:
-        data = response.json()
-        print(f"✅ Success: {data}")
-    else:
-        print(f"❌ Error Response: {response.text}")
+def test_mass_email_quota():
+    """Send the minimal mass-email request that reproduced the quota error."""
+    try:
+        logger.debug("🧪 Testing mass-email endpoint...")
+        response = SESSION.post(
+            'http://127.0.0.1:8001/agents/mailerpanda/mass-email',
+            data=dumps(TEST_REQUEST),
+            timeout=60
+        )
         
-except requests.exceptions.RequestException as e:
-    print(f"❌ Request Exception: {e}")
-except Exception as e:
-    print(f"❌ Unexpected Error: {e}")
+        logger.debug("Status Code: %s", response.status_code)
+        logger.debug("Response Headers: %s", response.headers)
+    
+        if response.status_code == 200:
+            data = loads(response.content)
+            logger.debug("✅ Success: %s", data)
+        else:
+            logger.error("❌ Error Response: %s", response.text)
+            
+    except requests.exceptions.RequestException:
+        logger.exception("❌ Request Exception")
+    except Exception:
+        logger.exception("❌ Unexpected Error")
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG)
+    test_mass_email_quota()
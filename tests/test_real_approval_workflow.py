@@ -5,6 +5,7 @@ Test MailerPanda with real consent tokens and human-in-the-loop approval workflo
 
 import os
 import sys
+import traceback
 from pathlib import Path
 
 # Load environment variables
@@ -15,6 +16,26 @@ load_dotenv()
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+from hushh_mcp.constants import ConsentScope
+
+# Scopes MailerPanda needs, and its API keys, resolved once at import
+REQUIRED_SCOPES = (
+    ConsentScope.VAULT_READ_EMAIL,
+    ConsentScope.VAULT_WRITE_EMAIL,
+    ConsentScope.VAULT_READ_FILE,
+    ConsentScope.VAULT_WRITE_FILE,
+    ConsentScope.CUSTOM_TEMPORARY
+)
+
+API_KEYS = {
+    key: os.environ.get(env_var)
+    for key, env_var in (
+        ('google_api_key', 'GOOGLE_API_KEY'),
+        ('mailjet_api_key', 'MAILJET_API_KEY'),
+        ('mailjet_api_secret', 'MAILJET_API_SECRET')
+    )
+}
+
 def generate_real_consent_tokens():
     """Generate real consent tokens for testing."""
     
@@ -22,8 +43,7 @@ def generate_real_consent_tokens():
     print("=" * 40)
     
     try:
-        from hushh_mcp.consent.token import issue_token
-        from hushh_mcp.constants import ConsentScope
+        from agent_helpers import issue_consent_tokens
         
         user_id = "test_user_real_tokens"
         agent_id = "agent_mailerpanda"
@@ -31,29 +51,9 @@ def generate_real_consent_tokens():
         print(f"👤 User ID: {user_id}")
         print(f"🤖 Agent ID: {agent_id}")
         
-        # Required scopes for MailerPanda
-        required_scopes = [
-            ConsentScope.VAULT_READ_EMAIL,
-            ConsentScope.VAULT_WRITE_EMAIL,
-            ConsentScope.VAULT_READ_FILE,
-            ConsentScope.VAULT_WRITE_FILE,
-            ConsentScope.CUSTOM_TEMPORARY
-        ]
-        
-        consent_tokens = {}
-        
-        for scope in required_scopes:
-            try:
-                token = issue_token(
-                    user_id=user_id,
-                    agent_id=agent_id,
-                    scope=scope,
-                    expires_in_ms=3600000  # 1 hour
-                )
-                consent_tokens[scope.value] = token
-                print(f"✅ Generated token for {scope.value}")
-            except Exception as e:
-                print(f"❌ Failed to generate token for {scope.value}: {e}")
+        consent_tokens = dict(issue_consent_tokens(user_id, agent_id, REQUIRED_SCOPES))
+        for scope_value in consent_tokens:
+            print(f"✅ Generated token for {scope_value}")
         
         return consent_tokens, user_id
         
@@ -77,15 +77,8 @@ def test_mailerpanda_with_approval_workflow():
     try:
         from hushh_mcp.agents.mailerpanda.index import MassMailerAgent
         
-        # Get API keys from environment
-        api_keys = {
-            'google_api_key': os.environ.get('GOOGLE_API_KEY'),
-            'mailjet_api_key': os.environ.get('MAILJET_API_KEY'),
-            'mailjet_api_secret': os.environ.get('MAILJET_API_SECRET')
-        }
-        
         print(f"\n🚀 Initializing MailerPanda agent...")
-        agent = MassMailerAgent(api_keys=api_keys)
+        agent = MassMailerAgent(api_keys=API_KEYS)
         print(f"✅ Agent initialized successfully!")
         
         # User input for email campaign with personalization
@@ -170,7 +163,6 @@ def test_mailerpanda_with_approval_workflow():
             
     except Exception as e:
         print(f"❌ Test Error: {str(e)}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -5,6 +5,7 @@ Test MailerPanda with real consent tokens and Excel personalization
 
 import os
 import sys
+import traceback
 from pathlib import Path
 
 # Load environment variables
@@ -15,6 +16,32 @@ load_dotenv()
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+from hushh_mcp.constants import ConsentScope
+
+try:
+    from openpyxl import load_workbook
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+# Scopes MailerPanda needs, and its API keys, resolved once at import
+REQUIRED_SCOPES = (
+    ConsentScope.VAULT_READ_EMAIL,
+    ConsentScope.VAULT_WRITE_EMAIL,
+    ConsentScope.VAULT_READ_FILE,
+    ConsentScope.VAULT_WRITE_FILE,
+    ConsentScope.CUSTOM_TEMPORARY
+)
+
+API_KEYS = {
+    key: os.environ.get(env_var)
+    for key, env_var in (
+        ('google_api_key', 'GOOGLE_API_KEY'),
+        ('mailjet_api_key', 'MAILJET_API_KEY'),
+        ('mailjet_api_secret', 'MAILJET_API_SECRET')
+    )
+}
+
 def generate_real_consent_tokens():
     """Generate real consent tokens for MailerPanda testing."""
     
@@ -22,8 +49,7 @@ def generate_real_consent_tokens():
     print("=" * 40)
     
     try:
-        from hushh_mcp.consent.token import issue_token
-        from hushh_mcp.constants import ConsentScope
+        from agent_helpers import issue_consent_tokens
         
         user_id = "test_user_real_consent"
         agent_id = "agent_mailerpanda"
@@ -32,29 +58,10 @@ def generate_real_consent_tokens():
         print(f"🤖 Agent ID: {agent_id}")
         
         # Generate real consent tokens for all required scopes
-        consent_tokens = {}
-        
-        required_scopes = [
-            ConsentScope.VAULT_READ_EMAIL,
-            ConsentScope.VAULT_WRITE_EMAIL,
-            ConsentScope.VAULT_READ_FILE,
-            ConsentScope.VAULT_WRITE_FILE,
-            ConsentScope.CUSTOM_TEMPORARY
-        ]
-        
-        for scope in required_scopes:
-            try:
-                token_obj = issue_token(
-                    user_id=user_id,
-                    agent_id=agent_id,
-                    scope=scope,
-                    expires_in_ms=3600000  # 1 hour
-                )
-                consent_tokens[scope.value] = token_obj.token
-                print(f"✅ Generated token for {scope.value}")
-                print(f"   Token: {token_obj.token[:50]}...")
-            except Exception as e:
-                print(f"❌ Failed to generate token for {scope.value}: {e}")
+        consent_tokens = dict(issue_consent_tokens(user_id, agent_id, REQUIRED_SCOPES))
+        for scope_value, token in consent_tokens.items():
+            print(f"✅ Generated token for {scope_value}")
+            print(f"   Token: {token[:50]}...")
         
         return consent_tokens, user_id
         
@@ -78,15 +85,8 @@ def test_excel_personalization():
     try:
         from hushh_mcp.agents.mailerpanda.index import MassMailerAgent
         
-        # Get API keys from environment
-        api_keys = {
-            'google_api_key': os.environ.get('GOOGLE_API_KEY'),
-            'mailjet_api_key': os.environ.get('MAILJET_API_KEY'),
-            'mailjet_api_secret': os.environ.get('MAILJET_API_SECRET')
-        }
-        
         print(f"\n🚀 Initializing MailerPanda agent...")
-        agent = MassMailerAgent(api_keys=api_keys)
+        agent = MassMailerAgent(api_keys=API_KEYS)
         print(f"✅ Agent initialized successfully!")
         
         # Test input for personalized email campaign
@@ -164,7 +164,6 @@ def test_excel_personalization():
         
     except Exception as e:
         print(f"❌ Test Error: {str(e)}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -176,24 +175,42 @@ def check_excel_file():
     
     excel_path = Path("hushh_mcp/agents/mailerpanda/email_list_with_descriptions.xlsx")
     
-    if excel_path.exists():
+    if not HAS_OPENPYXL:
+        print("⚠️  openpyxl library not found. Install with: pip install openpyxl")
+    elif excel_path.exists():
         print(f"✅ Excel file found: {excel_path}")
         
         try:
-            import pandas as pd
-            df = pd.read_excel(excel_path)
-            print(f"📊 Rows: {len(df)}")
-            print(f"📊 Columns: {list(df.columns)}")
+            # Stream the sheet once in read-only mode: count rows and descriptions, keep three samples
+            workbook = load_workbook(excel_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = list(next(rows))
+                desc_idx = header.index('description') if 'description' in header else -1
+                row_count = desc_count = 0
+                samples = []
+                for row in rows:
+                    if all(cell is None for cell in row):
+                        continue
+                    row_count += 1
+                    if desc_idx >= 0 and row[desc_idx] is not None:
+                        desc_count += 1
+                        if len(samples) < 3:
+                            samples.append((row_count, row[desc_idx]))
+            finally:
+                workbook.close()
+            
+            print(f"📊 Rows: {row_count}")
+            print(f"📊 Columns: {header}")
             
-            if 'description' in df.columns:
+            if desc_idx >= 0:
                 print(f"✅ Description column found!")
-                desc_count = df['description'].notna().sum()
-                print(f"📝 Contacts with descriptions: {desc_count}/{len(df)}")
+                print(f"📝 Contacts with descriptions: {desc_count}/{row_count}")
                 
                 # Show first few descriptions
                 print(f"\n📝 Sample Descriptions:")
-                for idx, desc in df[df['description'].notna()]['description'].head(3).items():
-                    print(f"  {idx+1}. {desc[:100]}...")
+                for row_number, desc in samples:
+                    print(f"  {row_number}. {desc[:100]}...")
             else:
                 print(f"❌ Description column not found!")
                 
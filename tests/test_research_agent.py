@@ -7,8 +7,12 @@ This script demonstrates how to interact with the Research Agent API
 and provides examples of all available functionality.
 """
 
+import atexit
+import io
 import json
+import sys
 import time
+from contextlib import redirect_stdout
 from pathlib import Path
 
 # Note: Requires requests library
@@ -23,6 +27,19 @@ except ImportError:
 API_BASE = "http://127.0.0.1:8001"
 TEST_USER_ID = "demo_user_123"
 
+# Every probe goes to the same server, so they share one keep-alive connection
+if HAS_REQUESTS:
+    SESSION = requests.Session()
+    SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    atexit.register(SESSION.close)
+
+def run_captured(func):
+    """Run func, returning its result and everything it printed."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = func()
+    return result, buffer.getvalue()
+
 def print_section(title):
     """Print a formatted section header."""
     print(f"\n{'='*60}")
@@ -47,7 +64,7 @@ def test_health():
         return False
         
     try:
-        response = requests.get(f"{API_BASE}/health", timeout=5)
+        response = SESSION.get(f"{API_BASE}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print_result(True, "API is healthy and responding", data)
@@ -71,7 +88,7 @@ def test_agent_discovery():
         return False
         
     try:
-        response = requests.get(f"{API_BASE}/agents", timeout=5)
+        response = SESSION.get(f"{API_BASE}/agents", timeout=5)
         if response.status_code == 200:
             data = response.json()
             agents = data.get("agents", {})
@@ -101,7 +118,7 @@ def test_research_status():
         return False
         
     try:
-        response = requests.get(f"{API_BASE}/agents/research/status", timeout=5)
+        response = SESSION.get(f"{API_BASE}/agents/research/status", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print_result(True, f"Research Agent Status: {data['status']}")
@@ -127,10 +144,14 @@ def demo_arxiv_search():
     print("   In a real frontend, you would get proper consent tokens first.")
     
     # Mock consent tokens (will fail validation)
+    timestamp = int(time.time())
     mock_tokens = {
-        "custom.temporary": f"HCT:mock_temp_{TEST_USER_ID}_{int(time.time())}",
-        "vault.read.file": f"HCT:mock_read_{TEST_USER_ID}_{int(time.time())}",
-        "vault.write.file": f"HCT:mock_write_{TEST_USER_ID}_{int(time.time())}"
+        scope: f"HCT:mock_{kind}_{TEST_USER_ID}_{timestamp}"
+        for scope, kind in (
+            ("custom.temporary", "temp"),
+            ("vault.read.file", "read"),
+            ("vault.write.file", "write")
+        )
     }
     
     payload = {
@@ -141,7 +162,7 @@ def demo_arxiv_search():
     
     try:
         print(f"   📤 Sending query: '{payload['query']}'")
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE}/agents/research/search/arxiv",
             json=payload,
             headers={"Content-Type": "application/json"},
@@ -163,11 +184,8 @@ def demo_arxiv_search():
         
     return False  # Expected to fail with mock tokens
 
-def show_integration_example():
-    """Show how to integrate with a real frontend."""
-    print_section("Frontend Integration Example")
-    
-    print("""
+# Printed verbatim by show_integration_example
+_INTEGRATION_EXAMPLE = """
 🌐 Frontend Integration Steps:
 
 1. **Get Consent Tokens** (implement proper consent flow):
@@ -223,7 +241,13 @@ def show_integration_example():
      })
    });
    ```
-""")
+"""
+
+def show_integration_example():
+    """Show how to integrate with a real frontend."""
+    print_section("Frontend Integration Example")
+    
+    print(_INTEGRATION_EXAMPLE)
 
 def main():
     """Run all tests and demos."""
@@ -245,10 +269,11 @@ def main():
         ("ArXiv Search Demo", demo_arxiv_search)
     ]
     
-    passed = 0
-    for test_name, test_func in tests:
-        if test_func():
-            passed += 1
+    # Each probe's output is buffered and all of it goes out in one write
+    results = [run_captured(test_func) for _, test_func in tests]
+    sys.stdout.write("".join(printed for _, printed in results))
+    
+    passed = sum(1 for test_passed, _ in results if test_passed)
     
     # Show integration examples
     show_integration_example()
@@ -1,32 +1,30 @@
 #!/usr/bin/env python3
 """
 Standalone Approval Workflow Test
+
+Needs the API server on port 8001. The tests share one campaign, so they are
+grouped onto a single worker when run with `pytest -n auto --dist loadgroup`.
 """
 
-import requests
 import json
 
+import httpx
+import pytest
+
 API_BASE_URL = "http://127.0.0.1:8001"
 
-def test_simple_approval():
-    """Test the approval workflow with a simple request"""
-    print("🚀 Testing Approval Workflow")
-    print("=" * 40)
-    
-    # Test backend status
+pytestmark = pytest.mark.xdist_group(name="mailerpanda_approval")
+
+def test_backend_status():
+    """The MailerPanda agent answers its status endpoint"""
     print("🔍 Testing backend status...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/agents/mailerpanda/status")
-        if response.status_code == 200:
-            print("✅ Backend is running")
-        else:
-            print(f"❌ Backend status check failed: {response.status_code}")
-            return
-    except Exception as e:
-        print(f"❌ Backend connection failed: {e}")
-        return
-    
-    # Test mass email creation
+    response = httpx.get(f"{API_BASE_URL}/agents/mailerpanda/status", timeout=30)
+    assert response.status_code == 200, f"Backend status check failed: {response.status_code}"
+    print("✅ Backend is running")
+
+@pytest.fixture(scope="module")
+def campaign_id():
+    """Create one mass email campaign for the approval actions to act on"""
     print("\n📧 Testing mass email creation...")
     mass_email_data = {
         "user_description": "Create a test email campaign",
@@ -34,61 +32,60 @@ def test_simple_approval():
         "enable_context_personalization": True,
         "demo_mode": False
     }
-    
+
     try:
-        response = requests.post(
+        response = httpx.post(
             f"{API_BASE_URL}/agents/mailerpanda/mass-email",
             json=mass_email_data,
-            headers={"Content-Type": "application/json"}
+            headers={"Content-Type": "application/json"},
+            timeout=30
         )
-        
+
         if response.status_code == 200:
             result = response.json()
             print("✅ Mass email created successfully!")
             campaign_id = result.get('campaign_id', 'test_campaign_123')
             print(f"📊 Campaign ID: {campaign_id}")
-        else:
-            print(f"❌ Mass email creation failed: {response.status_code}")
-            print(f"Response: {response.text}")
-            campaign_id = "test_campaign_123"  # Use dummy ID for testing
-    except Exception as e:
+            return campaign_id
+        print(f"❌ Mass email creation failed: {response.status_code}")
+        print(f"Response: {response.text}")
+    except httpx.HTTPError as e:
         print(f"❌ Mass email test failed: {e}")
-        campaign_id = "test_campaign_123"
-    
-    # Test approval workflow
+
+    return "test_campaign_123"  # Use dummy ID for testing
+
+def test_approval_actions(campaign_id):
+    """Every approval action is handled without a server error"""
     print(f"\n🔄 Testing approval actions for campaign: {campaign_id}")
-    
+
     approval_actions = ["modify", "regenerate", "approve", "reject"]
-    
-    for action in approval_actions:
-        print(f"\n🎯 Testing {action.upper()} action...")
-        
-        approval_data = {
-            "campaign_id": campaign_id,
-            "action": action,
-            "feedback": f"Test feedback for {action} action"
-        }
-        
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/agents/mailerpanda/approve",
-                json=approval_data,
-                headers={"Content-Type": "application/json"}
+
+    # Each action changes the campaign's session state, so they go one after another on one client
+    with httpx.Client(base_url=API_BASE_URL, timeout=30) as client:
+        responses = [
+            client.post(
+                "/agents/mailerpanda/approve",
+                json={
+                    "campaign_id": campaign_id,
+                    "action": action,
+                    "feedback": f"Test feedback for {action} action"
+                }
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                print(f"✅ {action.title()} action successful!")
-                print(f"📊 Response: {json.dumps(result, indent=2)}")
-            else:
-                print(f"❌ {action.title()} action failed: {response.status_code}")
-                print(f"Response: {response.text}")
-                
-        except Exception as e:
-            print(f"❌ {action.title()} test failed: {e}")
-    
-    print("\n" + "=" * 40)
-    print("🎉 Approval workflow testing completed!")
-
-if __name__ == "__main__":
-    test_simple_approval()
+            for action in approval_actions
+        ]
+
+    failures = []
+    for action, response in zip(approval_actions, responses):
+        print(f"\n🎯 Testing {action.upper()} action...")
+
+        if response.status_code == 200:
+            print(f"✅ {action.title()} action successful!")
+            print(f"📊 Response: {json.dumps(response.json(), indent=2)}")
+        else:
+            print(f"❌ {action.title()} action failed: {response.status_code}")
+            print(f"Response: {response.text}")
+            # An unknown (dummy) campaign is a 404; only server errors fail the test
+            if response.status_code >= 500:
+                failures.append(f"{action}: HTTP {response.status_code}")
+
+    assert not failures, f"Approval actions failed: {failures}"
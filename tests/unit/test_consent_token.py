@@ -0,0 +1,49 @@
+"""
+Pytest tests for HushhMCP consent token issuing
+
+Checks that batch-issued tokens share the single-token format and validate.
+"""
+
+import pytest
+
+from hushh_mcp.consent.token import issue_token, issue_tokens, validate_token
+from hushh_mcp.constants import ConsentScope
+
+
+SCOPES = [
+    ConsentScope.VAULT_READ_EMAIL,
+    ConsentScope.VAULT_WRITE_EMAIL,
+    ConsentScope.CUSTOM_TEMPORARY
+]
+
+
+class TestIssueTokens:
+    """Test suite for issue_tokens."""
+
+    def test_one_token_per_scope_in_order(self):
+        tokens = issue_tokens("user_batch", "agent_batch", SCOPES)
+
+        assert [token.scope for token in tokens] == SCOPES
+        assert len({token.issued_at for token in tokens}) == 1
+
+    @pytest.mark.parametrize("scope", SCOPES)
+    def test_each_token_validates_for_its_scope(self, scope):
+        token = issue_tokens("user_batch", "agent_batch", SCOPES)[SCOPES.index(scope)]
+
+        is_valid, error, parsed = validate_token(token.token, scope)
+
+        assert is_valid, error
+        assert parsed.user_id == "user_batch"
+        assert parsed.agent_id == "agent_batch"
+        assert parsed.scope == scope.value
+
+    def test_matches_issue_token_format(self):
+        batch_token = issue_tokens("user_batch", "agent_batch", [ConsentScope.VAULT_READ_EMAIL])[0]
+        single_token = issue_token("user_batch", "agent_batch", ConsentScope.VAULT_READ_EMAIL)
+
+        # Same prefix and same signed fields; only the timestamps may differ
+        assert batch_token.token.split(":")[0] == single_token.token.split(":")[0]
+        _, _, batch_parsed = validate_token(batch_token.token, ConsentScope.VAULT_READ_EMAIL)
+        _, _, single_parsed = validate_token(single_token.token, ConsentScope.VAULT_READ_EMAIL)
+        assert (batch_parsed.user_id, batch_parsed.agent_id, batch_parsed.scope) == \
+            (single_parsed.user_id, single_parsed.agent_id, single_parsed.scope)